@@ -0,0 +1,72 @@
+"""Small helpers shared by the post-simulation reporting code."""
+
+import mmap
+import re
+
+# A stats.txt line is "<name> <value> ..."; one multiline pattern walks the
+# whole mapping in C
+_STAT_LINE = re.compile(rb'^([\w.:+-]+)\s+(\S+)', re.MULTILINE)
+
+def parse_stats(stats_path, keys=None):
+    """Parse a gem5 stats.txt into a {name: value-string} dict.
+
+    When keys is given only those stat names are kept. A missing or empty
+    file yields an empty dict so callers can fall back gracefully.
+    """
+    wanted = set(keys) if keys is not None else None
+    stats = {}
+    try:
+        with open(stats_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for m in _STAT_LINE.finditer(mm):
+                    name = m.group(1).decode()
+                    if wanted is None or name in wanted:
+                        stats[name] = m.group(2).decode()
+    except (OSError, ValueError):
+        return {}
+    return stats
+
+# Cache of resolved attribute names keyed by (class name, metric). The first
+# call scans the candidate ladder; later calls reuse the winner so we pay
+# the SimObject proxy lookups only once per class.
+_ATTR_CACHE = {}
+
+def resolve_attr(obj, metric, names, default=0):
+    """Return the value of a stat, probing candidate attribute names and
+    memoizing the one that resolves."""
+    key = (type(obj).__name__, metric)
+    attr = _ATTR_CACHE.get(key)
+    if attr is not None:
+        try:
+            return getattr(obj, attr)
+        except AttributeError:
+            del _ATTR_CACHE[key]
+    for attr in names:
+        if hasattr(obj, attr):
+            _ATTR_CACHE[key] = attr
+            return getattr(obj, attr)
+    return default
+
+def stat_value(stats, name, default=0):
+    """Convert a parse_stats entry to a number, returning default when the
+    stat is missing or non-numeric."""
+    val = stats.get(name)
+    if val is None:
+        return default
+    try:
+        return int(val)
+    except ValueError:
+        try:
+            return float(val)
+        except ValueError:
+            return default
+
+def safe_div(n, d):
+    """Divide, returning 0.0 when the denominator is zero."""
+    return n / d if d else 0.0
+
+def compute_perf(cycles, instructions):
+    """Return (ipc, cpi) for the given cycle and instruction counts."""
+    ipc = safe_div(float(instructions), cycles)
+    cpi = safe_div(1.0, ipc)
+    return ipc, cpi
@@ -0,0 +1,114 @@
+"""Shared System construction for the simulation scripts.
+
+The clock-domain/membus/DRAM-controller boilerplate was pasted into every
+config script, so fixes and tuning had to land several times over. Build it
+here once: every script gets the same memory system and the config.ini gem5
+records stays comparable across scripts.
+"""
+
+import m5
+from m5.objects import *
+
+# Fixed memory configuration, parsed once at import
+MEM_SIZE = '512MB'
+MEM_RANGE = AddrRange(MEM_SIZE)
+
+def build_base_system(clock='1GHz', mem_range=MEM_RANGE, cpu_cls=None,
+                      mem_mode='timing'):
+    """Create a System with clock domain, memory bus and DRAM controller.
+
+    When cpu_cls is given, the CPU is constructed and its cache ports are
+    wired straight to the memory bus; leave it None for systems that insert
+    caches between CPU and bus (wire those with attach_l1_caches).
+    """
+    system = System()
+
+    # Set up the clock
+    system.clk_domain = SrcClockDomain()
+    system.clk_domain.clock = clock
+    system.clk_domain.voltage_domain = VoltageDomain()
+
+    # Memory
+    system.mem_mode = mem_mode
+    system.mem_ranges = [mem_range]
+
+    # Create memory bus
+    system.membus = SystemXBar()
+
+    # Create CPU and connect it straight to the bus
+    if cpu_cls is not None:
+        system.cpu = cpu_cls()
+        system.cpu.icache_port = system.membus.cpu_side_ports
+        system.cpu.dcache_port = system.membus.cpu_side_ports
+
+    # Create memory controller
+    attach_memory(system)
+
+    return system
+
+def attach_memory(system, model='ddr3'):
+    """Attach main memory to the memory bus.
+
+    'ddr3' builds the full DDR3 timing model. 'simple' uses fixed-latency
+    SimpleMemory instead, which is roughly an order of magnitude less event
+    work per access - appropriate for pipeline/predictor studies where
+    memory latency only needs to be held constant, not modeled faithfully.
+    """
+    if model == 'simple':
+        system.mem_ctrl = SimpleMemory(latency='30ns',
+                                       bandwidth='12.8GB/s',
+                                       range=system.mem_ranges[0])
+    else:
+        system.mem_ctrl = MemCtrl()
+        system.mem_ctrl.dram = DDR3_1600_8x8()
+        system.mem_ctrl.dram.range = system.mem_ranges[0]
+    system.mem_ctrl.port = system.membus.mem_side_ports
+
+def attach_l1_caches(system, l1_size='32kB', l1_assoc=2,
+                     l2_size='256kB', l2_assoc=8):
+    """Insert split L1 caches and a shared L2 between system.cpu and the
+    memory bus. The CPU's cache ports must still be unconnected."""
+    system.l1i = Cache(size=l1_size,
+                       assoc=l1_assoc,
+                       tag_latency=1,
+                       data_latency=1,
+                       response_latency=1,
+                       mshrs=4,
+                       tgts_per_mshr=20)
+
+    system.l1d = Cache(size=l1_size,
+                       assoc=l1_assoc,
+                       tag_latency=1,
+                       data_latency=1,
+                       response_latency=1,
+                       mshrs=4,
+                       tgts_per_mshr=20)
+
+    system.tol2bus = L2XBar()
+
+    system.l2 = Cache(size=l2_size,
+                      assoc=l2_assoc,
+                      tag_latency=2,
+                      data_latency=2,
+                      response_latency=2,
+                      mshrs=16,
+                      tgts_per_mshr=20)
+
+    # Connect CPU to L1 caches
+    system.l1i.cpu_side = system.cpu.icache_port
+    system.l1d.cpu_side = system.cpu.dcache_port
+
+    # Connect L1 caches to the L2 crossbar, the crossbar to the L2, and
+    # the L2 to the memory bus
+    system.l1i.mem_side = system.tol2bus.cpu_side_ports
+    system.l1d.mem_side = system.tol2bus.cpu_side_ports
+    system.l2.cpu_side = system.tol2bus.mem_side_ports
+    system.l2.mem_side = system.membus.cpu_side_ports
+
+def attach_workload(system, executable, options=None):
+    """Create a Process for the executable and install it on system.cpu."""
+    process = Process()
+    process.executable = executable
+    process.cmd = [executable, *(options or [])]
+    system.cpu.workload = process
+    return process
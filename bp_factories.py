@@ -0,0 +1,57 @@
+"""Shared branch predictor construction table.
+
+The per-script if/elif ladders duplicated predictor tuning and had already
+started to drift; keeping one factory table here means every script builds
+the same predictor for the same name and a new predictor is a one-line
+addition.
+"""
+
+from m5.objects import *
+
+# Predictor tuning, bound once at import so factories just splat the dicts
+TOURNAMENT_KW = dict(
+    localPredictorSize=2048,
+    localCtrBits=2,
+    globalPredictorSize=2048,
+    globalCtrBits=2,
+    choicePredictorSize=2048,
+    choiceCtrBits=2
+)
+BIMODE_KW = dict(
+    globalPredictorSize=2048,
+    globalCtrBits=2,
+    choicePredictorSize=2048,
+    choiceCtrBits=2
+)
+
+# Factories keyed by the --bp-type choices used by branch_prediction.py.
+# Lambdas defer SimObject construction until a CPU is actually being built.
+BP_FACTORIES = {
+    'none': lambda: NULL,
+    'static': lambda: StaticBP(),
+    'tournament': lambda: TournamentBP(**TOURNAMENT_KW),
+    'bimode': lambda: BiModeBP(**BIMODE_KW),
+}
+
+# Larger global/choice tables used by the superscalar and SMT scripts,
+# keyed by the CamelCase --bp-type choices those scripts expose
+SUPERSCALAR_TOURNAMENT_KW = dict(
+    localPredictorSize=2048,
+    localCtrBits=2,
+    globalPredictorSize=8192,
+    globalCtrBits=2,
+    choicePredictorSize=8192,
+    choiceCtrBits=2
+)
+SUPERSCALAR_BIMODE_KW = dict(
+    globalPredictorSize=8192,
+    choicePredictorSize=8192,
+    choiceCtrBits=2
+)
+
+SUPERSCALAR_BP_FACTORIES = {
+    'StaticBP': lambda: StaticBP(),
+    'LocalBP': lambda: LocalBP(localPredictorSize=2048, localCtrBits=2),
+    'TournamentBP': lambda: TournamentBP(**SUPERSCALAR_TOURNAMENT_KW),
+    'BiModeBP': lambda: BiModeBP(**SUPERSCALAR_BIMODE_KW),
+}
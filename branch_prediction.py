@@ -1,4 +1,5 @@
 import argparse
+import shlex
 import sys
 import os
 
@@ -9,6 +10,24 @@ sys.path.append(gem5_path)
 import m5
 from m5.objects import *
 
+from bp_factories import BP_FACTORIES
+from _stats_helpers import (resolve_attr, safe_div, compute_perf,
+                            parse_stats, stat_value)
+from _sys_builder import build_base_system, attach_workload
+
+# Candidate stat attribute names, in order of preference. gem5 versions have
+# renamed these over time, so we probe a ladder of known spellings.
+LOOKUP_ATTRS = [
+    'numBranches', 'numLookups', 'total_lookups',
+    'branches_processed', 'num_branches'
+]
+MISPREDICT_ATTRS = [
+    'numMispred', 'mispredicted', 'num_mispredicted',
+    'mispredictions', 'num_mispredictions'
+]
+INST_ATTRS = ['numInsts', 'committedInsts']
+CYCLE_ATTRS = ['numCycles']
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description='gem5 Branch Prediction Simulation')
     
@@ -22,73 +41,26 @@ def parse_arguments():
                         help='Path to the benchmark executable')
     parser.add_argument('--options', type=str, default='branch 10000',
                         help='Options to pass to the benchmark')
-    
-    return parser.parse_args()
+
+    args = parser.parse_args()
+    # Split once here; shlex keeps quoted arguments (e.g. paths with
+    # spaces) intact where str.split would break them
+    args.options_list = shlex.split(args.options)
+    return args
 
 def create_system(args):
-    # Create the system
-    system = System()
-    
-    # Set up the clock
-    system.clk_domain = SrcClockDomain()
-    system.clk_domain.clock = '1GHz'
-    system.clk_domain.voltage_domain = VoltageDomain()
-    
-    # Memory
-    system.mem_mode = 'timing'
-    system.mem_ranges = [AddrRange('512MB')]
-    
-    # Create memory bus
-    system.membus = SystemXBar()
-    
-    # Create CPU
-    system.cpu = DerivO3CPU()
-    
-    # Configure branch predictor
-    if args.bp_type == 'none':
-        # Disable branch prediction
-        system.cpu.branchPred = NULL
-    elif args.bp_type == 'static':
-        # Use a simple static predictor
-        system.cpu.branchPred = StaticBP()
-    elif args.bp_type == 'tournament':
-        # Use a tournament predictor with detailed configuration
-        system.cpu.branchPred = TournamentBP(
-            localPredictorSize=2048,
-            localCtrBits=2,
-            globalPredictorSize=2048,
-            globalCtrBits=2,
-            choicePredictorSize=2048,
-            choiceCtrBits=2
-        )
-    elif args.bp_type == 'bimode':
-        # Use a bimode predictor
-        system.cpu.branchPred = BiModeBP(
-            globalPredictorSize=2048,
-            globalCtrBits=2,
-            choicePredictorSize=2048,
-            choiceCtrBits=2
-        )
-    
-    # Connect CPU ports
-    system.cpu.icache_port = system.membus.cpu_side_ports
-    system.cpu.dcache_port = system.membus.cpu_side_ports
-    
-    # Create memory controller
-    system.mem_ctrl = MemCtrl()
-    system.mem_ctrl.dram = DDR3_1600_8x8()
-    system.mem_ctrl.dram.range = system.mem_ranges[0]
-    system.mem_ctrl.port = system.membus.mem_side_ports
-    
+    # Base system: clock, memory bus, DRAM controller, CPU on the bus
+    system = build_base_system(clock='1GHz', cpu_cls=DerivO3CPU)
+
+    # Configure branch predictor from the shared factory table
+    system.cpu.branchPred = BP_FACTORIES[args.bp_type]()
+
     # Set up the process
-    process = Process()
-    process.executable = args.cmd
-    process.cmd = [process.executable] + args.options.split()
-    system.cpu.workload = process
-    
+    attach_workload(system, args.cmd, args.options_list)
+
     # Create the root
     root = Root(full_system = False, system = system)
-    
+
     return system, root
 
 def main():
@@ -104,7 +76,10 @@ def main():
     # Simulate
     print(f"\n=== Running simulation with {args.bp_type} branch predictor ===")
     exit_event = m5.simulate()
-    
+
+    # Flush the stats system so stats.txt holds this run's final values
+    m5.stats.dump()
+
     # Print simulation results
     try:
         # Collect branch prediction statistics
@@ -117,60 +92,52 @@ def main():
             'accuracy': 0.0
         }
         
-        # Metric names to try
-        lookup_attrs = [
-            'numBranches', 'numLookups', 'total_lookups', 
-            'branches_processed', 'num_branches'
-        ]
-        mispredict_attrs = [
-            'numMispred', 'mispredicted', 'num_mispredicted', 
-            'mispredictions', 'num_mispredictions'
-        ]
-        
-        # Find branch lookups
-        for attr in lookup_attrs:
-            if hasattr(branch_pred, attr):
-                branch_metrics['lookups'] = getattr(branch_pred, attr)
-                break
-        
-        # Find branch mispredictions
-        for attr in mispredict_attrs:
-            if hasattr(branch_pred, attr):
-                branch_metrics['mispredicts'] = getattr(branch_pred, attr)
-                break
-        
+        # Read the stats system's authoritative values from stats.txt; the
+        # SimObject attribute probe is only a fallback for when the stats
+        # file is unavailable, since a renamed stat makes it silently
+        # report 0
+        stats = parse_stats(os.path.join(m5.options.outdir, 'stats.txt'))
+        branch_metrics['lookups'] = stat_value(
+            stats, 'system.cpu.branchPred.lookups',
+            resolve_attr(branch_pred, 'lookups', LOOKUP_ATTRS))
+        branch_metrics['mispredicts'] = stat_value(
+            stats, 'system.cpu.branchPred.condIncorrect',
+            resolve_attr(branch_pred, 'mispredicts', MISPREDICT_ATTRS))
+
         # Calculate accuracy
         if branch_metrics['lookups'] > 0:
-            branch_metrics['accuracy'] = (1 - branch_metrics['mispredicts'] / branch_metrics['lookups']) * 100
-        
-        # Instructions and IPC/CPI calculations
-        instructions = system.cpu.numInsts if hasattr(system.cpu, 'numInsts') else None
-        if instructions is None:
-            instructions = system.cpu.committedInsts if hasattr(system.cpu, 'committedInsts') else 0
-        
-        # Calculate cycles
-        cycles = system.cpu.numCycles if hasattr(system.cpu, 'numCycles') else 0
-        
-        # Calculate performance metrics
-        ipc = float(instructions) / cycles if cycles > 0 else 0
-        cpi = cycles / float(instructions) if instructions > 0 else 0
+            branch_metrics['accuracy'] = (
+                1 - safe_div(branch_metrics['mispredicts'],
+                             branch_metrics['lookups'])) * 100
+
+        # Instructions, cycles and the derived performance metrics
+        instructions = stat_value(
+            stats, 'simInsts',
+            resolve_attr(system.cpu, 'instructions', INST_ATTRS))
+        cycles = stat_value(
+            stats, 'system.cpu.numCycles',
+            resolve_attr(system.cpu, 'cycles', CYCLE_ATTRS))
+        ipc, cpi = compute_perf(cycles, instructions)
         
         # Prepare results directory
         results_dir = 'branch_prediction_results'
         os.makedirs(results_dir, exist_ok=True)
         
-        # Generate report
+        # Generate report; build the whole text first so the file sees a
+        # single write (and never a partial report if formatting fails)
         report_file = os.path.join(results_dir, 'branch_prediction_report.txt')
+        report = (
+            "===== BRANCH PREDICTION PERFORMANCE ANALYSIS =====\n\n"
+            "SUMMARY OF RESULTS:\n"
+            f"{'Predictor Type':<15} {'Cycles':<10} {'Instructions':<15} {'IPC':<8} {'CPI':<8} "
+            f"{'Branch Acc.%':<12} {'Branch Pred.':<15} {'Branch Mispr.'}\n"
+            f"{'-' * 100}\n"
+            f"{args.bp_type:<15} {cycles:<10} {instructions:<15} "
+            f"{ipc:<8.4f} {cpi:<8.4f} "
+            f"{branch_metrics['accuracy']:<12.2f} {branch_metrics['lookups']:<15} {branch_metrics['mispredicts']}\n"
+        )
         with open(report_file, 'w') as f:
-            f.write("===== BRANCH PREDICTION PERFORMANCE ANALYSIS =====\n\n")
-            f.write("SUMMARY OF RESULTS:\n")
-            f.write(f"{'Predictor Type':<15} {'Cycles':<10} {'Instructions':<15} {'IPC':<8} {'CPI':<8} ")
-            f.write(f"{'Branch Acc.%':<12} {'Branch Pred.':<15} {'Branch Mispr.'}\n")
-            f.write("-" * 100 + "\n")
-            
-            f.write(f"{args.bp_type:<15} {cycles:<10} {instructions:<15} ")
-            f.write(f"{ipc:<8.4f} {cpi:<8.4f} ")
-            f.write(f"{branch_metrics['accuracy']:<12.2f} {branch_metrics['lookups']:<15} {branch_metrics['mispredicts']}\n")
+            f.write(report)
         
         # Print results
         print(f"\nBranch Predictor: {args.bp_type}")
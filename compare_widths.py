@@ -4,6 +4,18 @@ import os
 import subprocess
 import time
 import csv
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from _stats_helpers import parse_stats
+
+# Simulated metrics pulled from each run's stats.txt; host wall time depends
+# on machine load, these are what the comparison is actually about
+STAT_KEYS = [
+    "system.cpu.numCycles",
+    "simInsts",
+    "system.cpu.branchPred.condPredicted",
+    "system.cpu.branchPred.condIncorrect",
+]
 
 # Define pipeline widths to test
 WIDTHS = [1, 2, 4, 8]
@@ -16,34 +28,63 @@ os.makedirs("superscalar_results", exist_ok=True)
 
 # CSV file to save results
 csv_file = "superscalar_results/comparison_results.csv"
+CSV_FIELDS = ["Width", "Branch Predictor", "Wall Time", "Output"] + STAT_KEYS
+
+# Wall times indexed by (width, bp_type) so the summary phase never has to
+# re-read the CSV
+results = {}
+
+def run_one(width, bp_type):
+    """Run a single gem5 simulation and return its results."""
+    print(f"\nRunning simulation with width={width}, bp={bp_type}")
+
+    # Give every configuration its own stats directory; parallel runs would
+    # otherwise stomp on the default m5out/, and serial runs lose history
+    outdir = f"m5out/w{width}_{bp_type}"
+    os.makedirs(outdir, exist_ok=True)
+
+    # Run the simulation, streaming its output straight to the per-config
+    # log file; buffering the whole log in memory can reach hundreds of MB
+    # per run once trace flags are enabled
+    output_file = f"superscalar_results/width_{width}_{bp_type}.txt"
+    cmd = ["wsl", "build/x86/gem5.opt", "--outdir", outdir,
+           "superscalar_simple.py", f"--width={width}", f"--bp-type={bp_type}"]
+    start_time = time.monotonic()
+    with open(output_file, "wb", buffering=1 << 20) as logf:
+        proc = subprocess.Popen(cmd, stdout=logf, stderr=subprocess.STDOUT)
+        proc.wait()
+    wall_time = time.monotonic() - start_time
+
+    # Pull the simulated metrics out of this run's stats.txt
+    stats = parse_stats(os.path.join(outdir, "stats.txt"), STAT_KEYS)
+
+    print(f"  width={width}, bp={bp_type} wall time: {wall_time:.2f} seconds")
+    print(f"  Output saved to: {output_file}")
+    return width, bp_type, wall_time, output_file, stats
+
+# The gem5 runs are independent single-threaded processes, so overlap them
+# across the host cores. Threads are enough: the work happens in the children.
+max_workers = min(len(WIDTHS) * len(BP_TYPES), os.cpu_count() or 1)
+rows = []
+with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    futures = {executor.submit(run_one, width, bp_type): (width, bp_type)
+               for width in WIDTHS for bp_type in BP_TYPES}
+    for future in as_completed(futures):
+        width, bp_type, wall_time, output_file, stats = future.result()
+        results[(width, bp_type)] = wall_time
+        row = {"Width": width, "Branch Predictor": bp_type,
+               "Wall Time": wall_time, "Output": output_file}
+        row.update({key: stats.get(key, '') for key in STAT_KEYS})
+        rows.append(row)
+
+# Write the CSV in one batch; named fields keep the columns right if more
+# metrics get added later. Sort so the file order is deterministic even
+# though runs finish out of order.
+rows.sort(key=lambda r: (r["Width"], r["Branch Predictor"]))
 with open(csv_file, "w", newline='') as f:
-    writer = csv.writer(f)
-    writer.writerow(["Width", "Branch Predictor", "Wall Time", "Output"])
-
-# Run simulations with different widths
-for width in WIDTHS:
-    for bp_type in BP_TYPES:
-        print(f"\nRunning simulation with width={width}, bp={bp_type}")
-        
-        # Run the simulation
-        start_time = time.time()
-        cmd = ["wsl", "build/x86/gem5.opt", "superscalar_simple.py", f"--width={width}", f"--bp-type={bp_type}"]
-        process = subprocess.run(cmd, capture_output=True, text=True)
-        wall_time = time.time() - start_time
-        
-        # Save results
-        output = process.stdout + process.stderr
-        with open(csv_file, "a", newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([width, bp_type, wall_time, output])
-        
-        # Save detailed output to file
-        output_file = f"superscalar_results/width_{width}_{bp_type}.txt"
-        with open(output_file, "w") as f:
-            f.write(output)
-        
-        print(f"  Wall time: {wall_time:.2f} seconds")
-        print(f"  Output saved to: {output_file}")
+    writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
 
 print(f"\nAll results saved to: {csv_file}")
 print("\nGenerating summary report...")
@@ -61,15 +102,10 @@ with open(report_file, "w") as f:
     for width in WIDTHS:
         f.write(f"{width:<10} ")
         for bp_type in BP_TYPES:
-            # Find the wall time for this configuration
-            with open(csv_file, "r", newline='') as csvf:
-                reader = csv.reader(csvf)
-                next(reader)  # Skip header
-                for row in reader:
-                    if int(row[0]) == width and row[1] == bp_type:
-                        wall_time = float(row[2])
-                        f.write(f"{wall_time:<15.2f} ")
-                        break
+            # Look up the wall time for this configuration
+            wall_time = results.get((width, bp_type))
+            if wall_time is not None:
+                f.write(f"{wall_time:<15.2f} ")
         f.write("\n")
     
     f.write("\nANALYSIS:\n")
@@ -1,60 +1,82 @@
 #!/usr/bin/env python3
 import argparse
+import mmap
+import re
+import sys
+
+STAGE_ORDER = ('Fetch1', 'Fetch2', 'Execute', 'Memory', 'Commit')
+
+# Formatted cells for the handful of stage-state strings MinorTrace emits;
+# indexing this is much cheaper than allocating a fresh f-string per cell
+STATE_CELL = {c: f' {c:^3} ' for c in 'EAFRBCDUIO-'}
+
+def _cell(state):
+    """Return the padded cell text for a stage state, memoizing any state
+    string not already in the table."""
+    cell = STATE_CELL.get(state)
+    if cell is None:
+        cell = STATE_CELL[state] = f' {state:^3} '
+    return cell
+
+# One compiled pass per line replaces the substring tests plus three
+# str.split calls; running over raw bytes also skips decoding the bulk of
+# the trace, only the short stage-state fields get decoded below
+TRACE_PAT = re.compile(rb'^\s*(\d+):[^\n]*activity=\S+\s+stages=([^\s\n]+)',
+                       re.MULTILINE)
 
 def parse_pipeline_trace(trace_file):
+    # Each stage maps cycle -> state so later lookups are O(1) instead of a
+    # linear scan over the whole trace per displayed cycle
     stages = {
-        'Fetch1': [],
-        'Fetch2': [],
-        'Execute': [],
-        'Memory': [],
-        'Commit': []
+        'Fetch1': {},
+        'Fetch2': {},
+        'Execute': {},
+        'Memory': {},
+        'Commit': {}
     }
-    
-    with open(trace_file, 'r') as f:
-        for line in f:
-            if 'activity=' in line and 'stages=' in line:
-                # Extract cycle number
-                cycle = int(line.split(':')[0].strip())
-                
-                # Extract stage information
-                stage_info = line.split('stages=')[1].strip()
-                stage_states = stage_info.split(',')
-                
+
+    # Map the trace once and let the regex engine walk the whole file in C,
+    # avoiding a Python-level string object per line
+    with open(trace_file, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for m in TRACE_PAT.finditer(mm):
+                cycle = int(m.group(1))
+                stage_states = m.group(2).split(b',', 4)
+
                 if len(stage_states) >= 5:  # Make sure we have all stages
-                    stages['Fetch1'].append((cycle, stage_states[0]))
-                    stages['Fetch2'].append((cycle, stage_states[1]))
-                    stages['Execute'].append((cycle, stage_states[2]))
-                    stages['Memory'].append((cycle, stage_states[3]))
-                    stages['Commit'].append((cycle, stage_states[4]))
-                    
+                    stages['Fetch1'][cycle] = stage_states[0].decode()
+                    stages['Fetch2'][cycle] = stage_states[1].decode()
+                    stages['Execute'][cycle] = stage_states[2].decode()
+                    stages['Memory'][cycle] = stage_states[3].decode()
+                    stages['Commit'][cycle] = stage_states[4].decode()
+
     return stages
 
 def find_active_cycles(stages):
     """Find cycles where there is activity in any stage."""
     active_cycles = set()
     for stage_data in stages.values():
-        for cycle, state in stage_data:
+        for cycle, state in stage_data.items():
             if state != 'E' and state != '-':
                 active_cycles.add(cycle)
-    return sorted(list(active_cycles))
+    return sorted(active_cycles)
 
 def print_pipeline_visualization(stages, start_cycle, num_cycles=20):
-    print("\nPipeline Visualization:")
-    print("Cycle   | F1  | F2  | EX  | MEM | COM")
-    print("---------------------------------------")
-    
-    for i in range(start_cycle, start_cycle + num_cycles):
-        cycle_info = [str(i).rjust(7)]
-        
-        for stage in ['Fetch1', 'Fetch2', 'Execute', 'Memory', 'Commit']:
-            state = '  -  '
-            for cycle, s in stages[stage]:
-                if cycle == i:
-                    state = f' {s:^3} '
-                    break
-            cycle_info.append(state)
-            
-        print(" | ".join(cycle_info))
+    # Build every row first and emit the whole table as one write instead
+    # of one line-buffered print per cycle
+    rows = [
+        "\nPipeline Visualization:",
+        "Cycle   | F1  | F2  | EX  | MEM | COM",
+        "---------------------------------------",
+    ]
+
+    rows.extend(
+        " | ".join([str(i).rjust(7),
+                    *[_cell(stages[s].get(i, '-')) for s in STAGE_ORDER]])
+        for i in range(start_cycle, start_cycle + num_cycles)
+    )
+
+    sys.stdout.write("\n".join(rows) + "\n")
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Visualize gem5 pipeline trace')
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Parallel parameter-sweep harness for the gem5 scripts.
+
+Each gem5.opt invocation is an independent single-threaded process, so a
+sweep over (width, threads, bp_type) saturates the host cores by running
+them concurrently. This module deliberately never imports m5; it only
+shells out to gem5 and tags every run's stats directory with its
+parameters.
+"""
+
+import argparse
+import itertools
+import os
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+GEM5 = "build/x86/gem5.opt"
+SCRIPT = "simple_smt_test.py"
+
+def run_one(combo):
+    """Launch one gem5 run for a (width, threads, bp_type) combination."""
+    width, threads, bp_type = combo
+    outdir = f"m5out/sweep_w{width}_t{threads}_{bp_type}"
+    os.makedirs(outdir, exist_ok=True)
+    cmd = [GEM5, "--outdir", outdir, SCRIPT,
+           f"--width={width}", f"--threads={threads}", f"--bp-type={bp_type}"]
+    start = time.monotonic()
+    with open(os.path.join(outdir, "run.log"), "wb") as logf:
+        rc = subprocess.run(cmd, stdout=logf, stderr=subprocess.STDOUT)
+    return combo, rc.returncode, time.monotonic() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Parallel gem5 parameter sweep')
+    parser.add_argument('--widths', type=str, default='1,2,4,8',
+                        help='Comma-separated pipeline widths')
+    parser.add_argument('--threads', type=str, default='1,2',
+                        help='Comma-separated hardware thread counts')
+    parser.add_argument('--bp-types', type=str,
+                        default='TournamentBP,LocalBP,BiModeBP,StaticBP',
+                        help='Comma-separated branch predictor types')
+    parser.add_argument('--jobs', type=int,
+                        default=max(1, (os.cpu_count() or 2) // 2),
+                        help='Number of concurrent gem5 processes')
+    args = parser.parse_args()
+
+    combos = list(itertools.product(
+        [int(w) for w in args.widths.split(',')],
+        [int(t) for t in args.threads.split(',')],
+        args.bp_types.split(',')))
+
+    print(f"Running {len(combos)} configurations on {args.jobs} workers")
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {executor.submit(run_one, combo): combo for combo in combos}
+        for future in as_completed(futures):
+            (width, threads, bp_type), rc, wall = future.result()
+            status = "ok" if rc == 0 else f"rc={rc}"
+            print(f"width={width} threads={threads} bp={bp_type}: "
+                  f"{status} in {wall:.2f}s")
+
+if __name__ == '__main__':
+    main()
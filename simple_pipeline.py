@@ -1,8 +1,30 @@
+import argparse
+
 import m5
 from m5.objects import *
 from m5.params import *
 from m5.proxy import *
 
+from _sys_builder import build_base_system, attach_workload
+
+# Debug flags per trace level; every enabled flag makes gem5 emit trace
+# lines each cycle, which slows the simulator by orders of magnitude, so
+# tracing is strictly opt-in
+TRACE_FLAGS = {
+    'none': (),
+    'minor': ('MinorTrace',),
+    # MinorTrace already records per-stage activity every cycle; the
+    # individual Fetch/Decode/Execute flags only duplicated those lines,
+    # so 'full' adds just the generic Pipeline events on top
+    'full': ('MinorTrace', 'Pipeline'),
+}
+
+parser = argparse.ArgumentParser(description='Simple pipeline simulation')
+parser.add_argument('--trace', type=str, default='none',
+                    choices=['none', 'minor', 'full'],
+                    help='Pipeline trace detail to record')
+args = parser.parse_args()
+
 class SimplePipeline(MinorCPU):
     type = 'SimplePipeline'
     cxx_header = "cpu/minor/cpu.hh"
@@ -44,50 +66,38 @@ class SimplePipeline(MinorCPU):
 
 def createSimplePipeline():
     """Create an instance of the simple pipeline CPU"""
-    system = System()
-    
-    # Set up the clock and voltage domains
-    system.clk_domain = SrcClockDomain()
-    system.clk_domain.clock = '1GHz'
-    system.clk_domain.voltage_domain = VoltageDomain()
-    
-    # Create our simple pipeline CPU
-    system.cpu = SimplePipeline()
-    
-    # Create memory bus and connect it to the CPU
-    system.membus = SystemXBar()
-    system.cpu.icache_port = system.membus.cpu_side_ports
-    system.cpu.dcache_port = system.membus.cpu_side_ports
-    
-    # Create a memory controller and connect it to the bus
-    system.mem_ctrl = MemCtrl()
-    system.mem_ctrl.dram = DDR3_1600_8x8()
-    system.mem_ctrl.dram.range = system.mem_ranges[0]
-    system.mem_ctrl.port = system.membus.mem_side_ports
-    
-    return system
+    return build_base_system(clock='1GHz', cpu_cls=SimplePipeline)
 
 # Create the system and CPU
 system = createSimplePipeline()
 
-# Enable debug flags for pipeline tracing
-m5.debug.flags["MinorTrace"] = True
-m5.debug.flags["Pipeline"] = True
-m5.debug.flags["Fetch"] = True
-m5.debug.flags["Decode"] = True
-m5.debug.flags["Execute"] = True
+# Enable pipeline tracing only when asked for, and send it to its own file
+# so stdout stays clean and pipeline_view.py can parse it directly
+if args.trace != 'none':
+    m5.trace.output("pipeline.trace")
+    for flag in TRACE_FLAGS[args.trace]:
+        m5.debug.flags[flag] = True
 
 # Create a simple test program (add two numbers)
 binary = b'\x48\x83\xc0\x01'  # Simple x86 instruction: add rax, 1
 
-# Write the test program to a temporary file
-with open('test.bin', 'wb') as f:
-    f.write(binary)
+# Write the test program to a temporary file, unless an identical one is
+# already on disk from a previous run
+binary_path = 'test.bin'
+
+def _read_existing(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+if _read_existing(binary_path) != binary:
+    with open(binary_path, 'wb') as f:
+        f.write(binary)
 
 # Set up the process to run
-process = Process()
-process.cmd = ['test.bin']
-system.cpu.workload = process
+attach_workload(system, binary_path)
 
 # Create the root object and start the simulation
 root = Root(full_system=False, system=system)
@@ -3,9 +3,21 @@
 import m5
 from m5.objects import *
 import argparse
+import atexit
+import io
 import os
+import shutil
 import sys
 
+from bp_factories import SUPERSCALAR_BP_FACTORIES
+from _stats_helpers import parse_stats, stat_value, compute_perf
+from _sys_builder import attach_memory
+
+# Resolve the workload path once at import; os.getcwd is a syscall and the
+# path never changes for the duration of a run
+CWD = os.getcwd()
+HELLO_BIN = os.path.join(CWD, 'tests/test-progs/hello/bin/x86/linux/hello')
+
 # Parse command-line arguments
 parser = argparse.ArgumentParser(description='Simple SMT Test')
 parser.add_argument('--width', type=int, default=4, 
@@ -15,8 +27,34 @@ parser.add_argument('--threads', type=int, default=2,
 parser.add_argument('--bp-type', type=str, default='TournamentBP',
                     choices=['StaticBP', 'LocalBP', 'TournamentBP', 'BiModeBP'],
                     help='Branch predictor type')
+parser.add_argument('--mem-model', type=str, default='ddr3',
+                    choices=['ddr3', 'simple'],
+                    help='Main memory model (simple trades DRAM fidelity '
+                         'for simulation speed)')
+parser.add_argument('--verbose', action='store_true',
+                    help='Print resource utilization diagnostics')
+parser.add_argument('--transient-outdir', action='store_true',
+                    help='Write m5out to tmpfs and discard it at exit')
+parser.add_argument('--checkpoint-dir', type=str, default=None,
+                    help='Checkpoint directory to restore from (or write '
+                         'with --take-checkpoint)')
+parser.add_argument('--take-checkpoint', type=int, default=0, metavar='TICKS',
+                    help='Simulate this many ticks, write a checkpoint to '
+                         '--checkpoint-dir and exit')
 args = parser.parse_args()
 
+if args.take_checkpoint and not args.checkpoint_dir:
+    parser.error('--take-checkpoint requires --checkpoint-dir')
+
+# For throwaway runs, keep the stats dump off the disk: redirect the output
+# directory to tmpfs and remove it when the process exits
+if args.transient_outdir:
+    _outdir = f'/dev/shm/gem5-{os.getpid()}'
+    os.makedirs(_outdir, exist_ok=True)
+    m5.options.outdir = _outdir
+    m5.core.setOutputDir(_outdir)
+    atexit.register(shutil.rmtree, _outdir, ignore_errors=True)
+
 # Create the system
 system = System()
 
@@ -36,31 +74,29 @@ system.membus = SystemXBar()
 system.cpu = DerivO3CPU()
 system.cpu.numThreads = args.threads
 
-# Configure superscalar width parameters
-system.cpu.fetchWidth = args.width
-system.cpu.decodeWidth = args.width
-system.cpu.renameWidth = args.width
-system.cpu.dispatchWidth = args.width
-system.cpu.issueWidth = args.width
-system.cpu.wbWidth = args.width
-system.cpu.commitWidth = args.width
-
-# Set reasonable queue sizes based on width
-system.cpu.numROBEntries = args.width * 32
-system.cpu.LQEntries = args.width * 16
-system.cpu.SQEntries = args.width * 16
-system.cpu.numIQEntries = args.width * 16
-
-# Configure branch predictor
-if args.bp_type == 'TournamentBP':
-    system.cpu.branchPred = TournamentBP(
-        localPredictorSize=2048,
-        localCtrBits=2,
-        globalPredictorSize=8192,
-        globalCtrBits=2,
-        choicePredictorSize=8192,
-        choiceCtrBits=2
-    )
+# Configure superscalar width parameters and width-scaled queue sizes in
+# one table-driven pass
+width_params = {
+    'fetchWidth': args.width,
+    'decodeWidth': args.width,
+    'renameWidth': args.width,
+    'dispatchWidth': args.width,
+    'issueWidth': args.width,
+    'wbWidth': args.width,
+    'commitWidth': args.width,
+    # Reasonable queue sizes based on width
+    'numROBEntries': args.width * 32,
+    'LQEntries': args.width * 16,
+    'SQEntries': args.width * 16,
+    'numIQEntries': args.width * 16,
+}
+for param, value in width_params.items():
+    setattr(system.cpu, param, value)
+
+# Configure branch predictor from the shared factory table, so every
+# --bp-type choice actually takes effect and uses the same tuning as the
+# superscalar script
+system.cpu.branchPred = SUPERSCALAR_BP_FACTORIES[args.bp_type]()
 
 # Create and connect interrupt controller
 system.cpu.createInterruptController()
@@ -108,24 +144,27 @@ system.l2.cpu_side = system.tol2bus.mem_side_ports
 # Connect L2 cache to memory bus
 system.l2.mem_side = system.membus.cpu_side_ports
 
-# Create memory controller
-system.mem_ctrl = MemCtrl()
-system.mem_ctrl.dram = DDR3_1600_8x8()
-system.mem_ctrl.dram.range = system.mem_ranges[0]
-system.mem_ctrl.port = system.membus.mem_side_ports
+# Attach main memory; with 'simple' the memory latency is held constant,
+# which keeps predictor/width comparisons valid while cutting DRAM-model
+# event work
+attach_memory(system, args.mem_model)
 
 # Connect system port
 system.system_port = system.membus.cpu_side_ports
 
-# Create processes for each thread
+# Create processes for each thread. The threads are homogeneous, so check
+# the binary and build the command once and share it across the Process
+# objects (each thread still needs its own executable path to avoid the
+# ISA issue).
+if not os.path.exists(HELLO_BIN):
+    sys.exit(f"Workload binary not found: {HELLO_BIN}")
+hello_cmd = [HELLO_BIN]
+
 system.cpu.workload = []
 for i in range(args.threads):
     process = Process()
-    # Use the hello program that exists in the gem5 environment
-    executable_path = os.path.join(os.getcwd(), 'tests/test-progs/hello/bin/x86/linux/hello')
-    process.cmd = [executable_path]
-    # Ensure each thread has its own executable path to fix the ISA issue
-    process.executable = executable_path
+    process.cmd = hello_cmd
+    process.executable = HELLO_BIN
     system.cpu.workload.append(process)
 
 # Create threads after all workloads are added
@@ -141,11 +180,24 @@ print(f"Hardware Threads: {args.threads}")
 print(f"Branch Predictor: {args.bp_type}")
 print("===========================================\n")
 
-# Instantiate simulation
-m5.instantiate()
+# Instantiate simulation, restoring from a checkpoint when one exists so
+# sweep iterations skip the workload's startup region instead of
+# re-simulating it for every configuration
+if (args.checkpoint_dir and not args.take_checkpoint
+        and os.path.isdir(args.checkpoint_dir)):
+    print(f"Restoring from checkpoint: {args.checkpoint_dir}")
+    m5.instantiate(args.checkpoint_dir)
+else:
+    m5.instantiate()
 
 # Run simulation
 print("Starting simulation...")
+if args.take_checkpoint:
+    exit_event = m5.simulate(args.take_checkpoint)
+    m5.checkpoint(args.checkpoint_dir)
+    print(f"Checkpoint written to {args.checkpoint_dir} "
+          f"at tick {m5.curTick()}")
+    sys.exit(0)
 exit_event = m5.simulate()
 print(f"Exiting @ tick {m5.curTick()} because {exit_event.getCause()}")
 
@@ -153,63 +205,55 @@ print(f"Exiting @ tick {m5.curTick()} because {exit_event.getCause()}")
 print("\nDumping statistics...")
 m5.stats.dump()
 
+# Read everything from the dumped stats file in one pass instead of a
+# pybind attribute probe (and a raised AttributeError) per metric
+stats = parse_stats(os.path.join(m5.options.outdir, 'stats.txt'))
+
+# Buffer the report and flush it with a single write instead of one
+# line-buffered print per metric
+buf = io.StringIO()
+_p = buf.write
+
 # Print performance statistics
-print("\n===== PERFORMANCE STATISTICS =====")
+_p("\n===== PERFORMANCE STATISTICS =====\n")
 
 # Get CPU stats
-try:
-    cycles = system.cpu.numCycles
-    print(f"Cycles: {cycles}")
-except AttributeError:
-    print("Could not access numCycles")
-    cycles = 0
-    
+cycles = stat_value(stats, 'system.cpu.numCycles')
+_p(f"Cycles: {cycles}\n")
+
 # Per-thread statistics
 total_instructions = 0
 for i in range(args.threads):
-    try:
-        thread_insts = system.cpu.committedInsts[i]
-        print(f"Thread {i} Instructions: {thread_insts}")
+    thread_insts = stat_value(stats, f'system.cpu.committedInsts::{i}', None)
+    if thread_insts is None:
+        _p(f"Could not access instructions for thread {i}\n")
+    else:
+        _p(f"Thread {i} Instructions: {thread_insts}\n")
         total_instructions += thread_insts
-    except (AttributeError, IndexError):
-        print(f"Could not access instructions for thread {i}")
 
-print(f"Total Instructions: {total_instructions}")
+_p(f"Total Instructions: {total_instructions}\n")
 
 # Calculate IPC and CPI
 if cycles > 0 and total_instructions > 0:
-    ipc = total_instructions / cycles
-    cpi = cycles / total_instructions
-    print(f"Overall IPC (Instructions Per Cycle): {ipc:.4f}")
-    print(f"Overall CPI (Cycles Per Instruction): {cpi:.4f}")
+    ipc, cpi = compute_perf(cycles, total_instructions)
+    _p(f"Overall IPC (Instructions Per Cycle): {ipc:.4f}\n")
+    _p(f"Overall CPI (Cycles Per Instruction): {cpi:.4f}\n")
 else:
-    print("Cannot calculate IPC/CPI: cycles or instructions is zero")
-
-# Resource utilization
-print("\n===== RESOURCE UTILIZATION =====")
-try:
-    # ROB utilization
-    try:
-        rob_util = system.cpu.rob.rob_utilization
-        print(f"ROB Utilization: {rob_util:.2f}%")
-    except AttributeError:
-        print("Could not access ROB utilization")
-    
-    # Issue queue utilization
-    try:
-        iq_util = system.cpu.iq.iq_utilization
-        print(f"Issue Queue Utilization: {iq_util:.2f}%")
-    except AttributeError:
-        print("Could not access issue queue utilization")
-    
-    # Load/Store queue utilization
-    try:
-        lq_util = system.cpu.lsq.lq_utilization
-        sq_util = system.cpu.lsq.sq_utilization
-        print(f"Load Queue Utilization: {lq_util:.2f}%")
-        print(f"Store Queue Utilization: {sq_util:.2f}%")
-    except AttributeError:
-        print("Could not access LQ/SQ utilization")
-
-except Exception as e:
-    print(f"Error accessing resource utilization statistics: {e}")
+    _p("Cannot calculate IPC/CPI: cycles or instructions is zero\n")
+
+# Resource utilization; a diagnostic, skipped entirely unless asked for
+if args.verbose:
+    _p("\n===== RESOURCE UTILIZATION =====\n")
+    for label, key in (
+            ("ROB Utilization", 'system.cpu.rob.rob_utilization'),
+            ("Issue Queue Utilization", 'system.cpu.iq.iq_utilization'),
+            ("Load Queue Utilization", 'system.cpu.lsq.lq_utilization'),
+            ("Store Queue Utilization", 'system.cpu.lsq.sq_utilization')):
+        util = stat_value(stats, key, None)
+        if util is None:
+            _p(f"Could not access {label}\n")
+        else:
+            _p(f"{label}: {util:.2f}%\n")
+
+sys.stdout.write(buf.getvalue())
+sys.stdout.flush()
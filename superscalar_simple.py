@@ -3,168 +3,400 @@
 import m5
 from m5.objects import *
 import argparse
+
+from bp_factories import SUPERSCALAR_BP_FACTORIES
+from _stats_helpers import parse_stats, stat_value, compute_perf
+from _sys_builder import attach_memory
 import os
+import shutil
+import subprocess
 import sys
 import time
 
-def create_superscalar_cpu(width=2, bp_type='TournamentBP'):
-    """Create a MinorCPU with superscalar configuration"""
+# Benchmark workload; rebuilt from source only when the source is newer
+BENCHMARK_SRC = 'tests/branch_test.c'
+BENCHMARK_BIN = 'tests/branch_test'
+
+# Pipeline parameters the CPU factories configure, used by the --debug dump.
+# A fixed tuple of names replaces probing dir(cpu) (hundreds of pybind
+# attribute fetches, most of them methods) and only shows knobs we set.
+MINOR_WIDTH_PARAMS = (
+    'fetch1LineSnapWidth',
+    'fetch1ToFetch2ForwardDelay',
+    'fetch2ToDecodeForwardDelay',
+    'decodeToExecuteForwardDelay',
+    'executeToMemoryForwardDelay',
+    'memoryToWritebackForwardDelay',
+    'executeAllowEarlyMemoryIssue',
+    'executeBranchDelay',
+    'executeCommitLimit',
+    'executeMemoryCommitLimit',
+    'executeInputBufferSize',
+    'executeIssueLimit',
+    'executeLSQMaxStoreBufferStoresPerCycle',
+    'executeLSQRequestsQueueSize',
+    'executeLSQStoreBufferSize',
+    'executeLSQTransfersQueueSize',
+    'executeMaxAccessesInMemory',
+    'executeMemoryWidth',
+    'executeSetTraceTimeOnCommit',
+    'decodeInputWidth',
+    'decodeToExecuteForwardWidth',
+    'executeInputWidth',
+    'executeCycleInput',
+    'fetch1LineWidth',
+    'fetch1ToFetch2ForwardWidth',
+    'fetch2InputBufferSize',
+    'fetch2ToDecodeForwardWidth',
+)
+
+O3_WIDTH_PARAMS = (
+    'fetchWidth',
+    'decodeWidth',
+    'renameWidth',
+    'dispatchWidth',
+    'issueWidth',
+    'wbWidth',
+    'commitWidth',
+    'numROBEntries',
+    'numIQEntries',
+    'LQEntries',
+    'SQEntries',
+    'numPhysIntRegs',
+    'numPhysFloatRegs',
+)
+
+def compile_benchmark(source_path=BENCHMARK_SRC, benchmark_path=BENCHMARK_BIN):
+    """Build the benchmark binary if its source has changed.
+
+    Returns True when an up-to-date binary exists afterwards. A repeat run
+    with an unchanged source costs two stat calls instead of a gcc
+    invocation; a missing source just means we use whatever binary is
+    already on disk.
+    """
+    if not os.path.exists(source_path):
+        return os.path.exists(benchmark_path)
+    if (os.path.exists(benchmark_path) and
+            os.path.getmtime(benchmark_path) >= os.path.getmtime(source_path)):
+        return True
+    compile_cmd = ((['ccache'] if shutil.which('ccache') else []) +
+                   ['gcc', '-O3', '-pipe', '-o', benchmark_path, source_path])
+    result = subprocess.run(compile_cmd)
+    return result.returncode == 0
+
+def create_superscalar_cpu(width=2, bp_type='TournamentBP', forward_delay=None):
+    """Create a MinorCPU with superscalar configuration.
+
+    forward_delay sets the front-end stage-to-stage forwarding latency.
+    The old unconditional delay of 1 inflated the scalar baseline's CPI
+    (back-to-back independent ops paid an extra cycle per stage crossing),
+    overstating any superscalar speedup measured against it. Default to 0
+    for width 1 and 1 for wider pipelines.
+    """
     cpu = MinorCPU()
-    
-    # Configure pipeline stages for superscalar operation
-    cpu.fetch1LineSnapWidth = 0  # Ensure clean stage boundaries
-    cpu.fetch1ToFetch2ForwardDelay = 1  # Stage delay between fetch stages
-    cpu.fetch2ToDecodeForwardDelay = 1  # Delay between fetch and decode
-    cpu.decodeToExecuteForwardDelay = 1  # Delay between decode and execute
-    cpu.executeToMemoryForwardDelay = 1  # Delay between execute and memory
-    cpu.memoryToWritebackForwardDelay = 1  # Delay between memory and writeback
-
-    # Configure execution stage for superscalar operation
-    cpu.executeAllowEarlyMemoryIssue = True  # Allow memory operations to issue early
-    cpu.executeBranchDelay = 1  # Branch resolution delay
-    cpu.executeCommitLimit = width  # Number of instructions that can be committed per cycle
-    cpu.executeMemoryCommitLimit = width  # Memory instructions per cycle
-    cpu.executeInputBufferSize = width * 4  # Size of input buffer to execute stage
-    cpu.executeIssueLimit = width  # Instructions issued per cycle
-    cpu.executeLSQMaxStoreBufferStoresPerCycle = width  # Store buffer bandwidth
-    cpu.executeLSQRequestsQueueSize = width * 2  # LSQ size
-    cpu.executeLSQStoreBufferSize = width * 4  # Store buffer size
-    cpu.executeLSQTransfersQueueSize = width * 2  # LSQ transfer queue size
-    cpu.executeMaxAccessesInMemory = width * 2  # Maximum number of concurrent memory accesses
-    cpu.executeMemoryWidth = width  # Memory operation width
-    cpu.executeSetTraceTimeOnCommit = True  # Set instruction trace times on commit
-
-    # Pipeline widths for superscalar operation
-    cpu.decodeInputWidth = width  # Instructions per cycle at decode input
-    cpu.decodeToExecuteForwardWidth = width  # Width between decode and execute
-    cpu.executeInputWidth = width  # Instructions per cycle at execute input
-    cpu.executeCycleInput = True  # Enable cycle-by-cycle input to execute
-    cpu.fetch1LineWidth = width  # Instruction fetch width
-    cpu.fetch1ToFetch2ForwardWidth = width  # Width between fetch stages
-    cpu.fetch2InputBufferSize = width * 2  # Size of fetch2 input buffer
-    cpu.fetch2ToDecodeForwardWidth = width  # Width between fetch2 and decode
-    
-    # Configure branch predictor
-    if bp_type == 'StaticBP':
-        cpu.branchPred = StaticBP()
-    elif bp_type == 'LocalBP':
-        cpu.branchPred = LocalBP(
-            localPredictorSize=2048,
-            localCtrBits=2
-        )
-    elif bp_type == 'TournamentBP':
-        cpu.branchPred = TournamentBP(
-            localPredictorSize=2048,
-            localCtrBits=2,
-            globalPredictorSize=8192,
-            globalCtrBits=2,
-            choicePredictorSize=8192,
-            choiceCtrBits=2
-        )
-    elif bp_type == 'BiModeBP':
-        cpu.branchPred = BiModeBP(
-            globalPredictorSize=8192,
-            choicePredictorSize=8192,
-            choiceCtrBits=2
-        )
-    
+
+    if forward_delay is None:
+        forward_delay = 0 if width == 1 else 1
+
+    # Pipeline configuration for superscalar operation, applied in a single
+    # table-driven pass
+    params = {
+        # Pipeline stages
+        'fetch1LineSnapWidth': 0,  # Ensure clean stage boundaries
+        'fetch1ToFetch2ForwardDelay': forward_delay,  # Stage delay between fetch stages
+        'fetch2ToDecodeForwardDelay': forward_delay,  # Delay between fetch and decode
+        'decodeToExecuteForwardDelay': forward_delay,  # Delay between decode and execute
+        'executeToMemoryForwardDelay': 1,  # Delay between execute and memory
+        'memoryToWritebackForwardDelay': 1,  # Delay between memory and writeback
+
+        # Execution stage
+        'executeAllowEarlyMemoryIssue': True,  # Allow memory operations to issue early
+        'executeBranchDelay': 1,  # Branch resolution delay
+        'executeCommitLimit': width,  # Number of instructions that can be committed per cycle
+        'executeMemoryCommitLimit': width,  # Memory instructions per cycle
+        'executeInputBufferSize': max(width * 4, 8),  # Size of input buffer to execute stage
+        'executeIssueLimit': width,  # Instructions issued per cycle
+        'executeLSQMaxStoreBufferStoresPerCycle': width,  # Store buffer bandwidth
+        'executeLSQRequestsQueueSize': width * 2,  # LSQ size
+        'executeLSQStoreBufferSize': width * 4,  # Store buffer size
+        'executeLSQTransfersQueueSize': width * 2,  # LSQ transfer queue size
+        'executeMaxAccessesInMemory': width * 2,  # Maximum number of concurrent memory accesses
+        'executeMemoryWidth': width,  # Memory operation width
+        'executeSetTraceTimeOnCommit': True,  # Set instruction trace times on commit
+
+        # Pipeline widths
+        'decodeInputWidth': width,  # Instructions per cycle at decode input
+        'decodeToExecuteForwardWidth': width,  # Width between decode and execute
+        'executeInputWidth': width,  # Instructions per cycle at execute input
+        'executeCycleInput': True,  # Enable cycle-by-cycle input to execute
+        # Overprovision fetch relative to decode/execute: with fetch
+        # bandwidth exactly equal to commit width the front end drains on
+        # every stall and mispredict recovery serializes, so fetch becomes
+        # the limiter instead of the stage under study
+        'fetch1LineWidth': width * 2,  # Instruction fetch width
+        'fetch1ToFetch2ForwardWidth': width * 2,  # Width between fetch stages
+        'fetch2InputBufferSize': width * 4,  # Size of fetch2 input buffer
+        'fetch2ToDecodeForwardWidth': width,  # Width between fetch2 and decode
+    }
+    for param, value in params.items():
+        setattr(cpu, param, value)
+
+    # Scale the functional units with the issue width; see make_fu_pool
+    cpu.executeFuncUnits = make_fu_pool(width)
+
+    # Configure branch predictor from the shared factory table
+    cpu.branchPred = make_branch_pred(bp_type)
+
     return cpu
 
-def main():
-    parser = argparse.ArgumentParser(description='Superscalar Pipeline Test')
-    parser.add_argument('--width', type=int, default=2, 
-                        help='Width of the pipeline (instructions per stage)')
-    parser.add_argument('--bp-type', type=str, default='TournamentBP',
-                        choices=['StaticBP', 'LocalBP', 'TournamentBP', 'BiModeBP'],
-                        help='Branch predictor type')
-    args = parser.parse_args()
-    
-    # Create the system
-    system = System()
-    
-    # Set up clock domain
-    system.clk_domain = SrcClockDomain()
-    system.clk_domain.clock = '2GHz'
-    system.clk_domain.voltage_domain = VoltageDomain()
-    
-    # Set up memory mode
-    system.mem_mode = 'timing'
-    system.mem_ranges = [AddrRange('512MB')]
-    
-    # Create a memory bus
-    system.membus = SystemXBar()
-    
-    # Create CPU - using our superscalar configuration
-    system.cpu = create_superscalar_cpu(width=args.width, bp_type=args.bp_type)
-    
-    # Create and connect interrupt controller
-    system.cpu.createInterruptController()
-    
+def make_fu_pool(width):
+    """Build a MinorFUPool with one integer ALU per issue slot.
+
+    The default pool carries a fixed set of units, so raising
+    executeIssueLimit to width just moves the serialization point onto
+    the shared ALU: apparent commit width goes up while integer ops still
+    issue one per cycle. Provision width single-cycle IntFUs and keep one
+    of each specialized unit; the Mem FU's opLat matches the 1-cycle L1D
+    tag/data latency so load timing stays consistent with the caches.
+    """
+    int_fus = []
+    for _ in range(width):
+        fu = MinorDefaultIntFU()
+        fu.opLat = 1
+        int_fus.append(fu)
+    mem_fu = MinorDefaultMemFU()
+    mem_fu.opLat = 1
+    return MinorFUPool(funcUnits=int_fus + [MinorDefaultIntMulFU(),
+                                            MinorDefaultIntDivFU(),
+                                            MinorDefaultFloatSimdFU(),
+                                            mem_fu,
+                                            MinorDefaultMiscFU()])
+
+def make_branch_pred(bp_type):
+    """Build a branch predictor, falling back to the tournament predictor
+    for unknown names."""
+    factory = SUPERSCALAR_BP_FACTORIES.get(
+        bp_type, SUPERSCALAR_BP_FACTORIES['TournamentBP'])
+    return factory()
+
+def create_o3_cpu(width, bp_type):
+    """Create a DerivO3CPU sized for the requested superscalar width.
+
+    MinorCPU is strictly in-order, so its width knobs cap IPC well below
+    the nominal width; the out-of-order model is what actually exploits
+    the ILP a superscalar study is after.
+    """
+    cpu = DerivO3CPU()
+
+    params = {
+        'fetchWidth': width,
+        'decodeWidth': width,
+        'renameWidth': width,
+        'dispatchWidth': width,
+        'issueWidth': width,
+        'wbWidth': width,
+        'commitWidth': width,
+        # Width-scaled structures so the wider pipeline is not starved
+        'numROBEntries': 32 * width,
+        'numIQEntries': 16 * width,
+        'LQEntries': 16 * width,
+        'SQEntries': 16 * width,
+        'numPhysIntRegs': 64 + 8 * width,
+        'numPhysFloatRegs': 64 + 8 * width,
+    }
+    for param, value in params.items():
+        setattr(cpu, param, value)
+
+    cpu.branchPred = make_branch_pred(bp_type)
+
+    return cpu
+
+def create_caches(system, width, l1_assoc=2, l2_assoc=8,
+                  l1d_mshrs=None, l2_mshrs=None):
+    """Build the L1/L2 hierarchy, scaling miss tracking with pipeline width.
+
+    The CPU tries to keep up to width*2 memory accesses in flight, so the
+    caches need MSHRs to match or the pipeline stays latency-bound no
+    matter how wide it is (achievable bandwidth is outstanding misses over
+    latency). Explicit CLI values override the scaling for sweeps.
+    """
+    if l1d_mshrs is None:
+        l1d_mshrs = max(8, 4 * width)
+    if l2_mshrs is None:
+        l2_mshrs = max(16, 8 * width)
+    l1d_tgts = max(20, 8 * width)
+
     # Create L1 caches
     system.l1i = Cache(size='32kB',
-                     assoc=2,
+                     assoc=l1_assoc,
                      tag_latency=1,
                      data_latency=1,
                      response_latency=1,
                      mshrs=4,
                      tgts_per_mshr=20)
-    
+
+    # The L1D gets a stride prefetcher so the widened MSHR file is
+    # actually occupied: demand misses alone rarely keep more than a few
+    # in flight, and throughput is outstanding misses over latency.
+    # writeback_clean keeps clean evictions out of the MSHRs so they
+    # never displace demand misses.
     system.l1d = Cache(size='32kB',
-                     assoc=2,
+                     assoc=l1_assoc,
                      tag_latency=1,
                      data_latency=1,
                      response_latency=1,
-                     mshrs=4,
-                     tgts_per_mshr=20)
-    
+                     mshrs=l1d_mshrs,
+                     tgts_per_mshr=l1d_tgts,
+                     prefetcher=StridePrefetcher(degree=width, latency=1),
+                     writeback_clean=True)
+
     # Create a crossbar to connect L1 caches to L2 cache
     system.tol2bus = L2XBar()
-    
+
     # Create L2 cache
     system.l2 = Cache(size='256kB',
-                     assoc=8,
+                     assoc=l2_assoc,
                      tag_latency=2,
                      data_latency=2,
                      response_latency=2,
-                     mshrs=16,
-                     tgts_per_mshr=20)
-    
-    # Connect CPU to L1 caches
+                     mshrs=l2_mshrs,
+                     tgts_per_mshr=20,
+                     prefetcher=StridePrefetcher(degree=2 * width))
+
+def build_memory_system(system, args, width):
+    """Create the memory bus, the cache hierarchy and main memory.
+
+    With 'simple' memory the latency is held constant, which keeps
+    predictor/width comparisons valid while cutting DRAM-model event work.
+    """
+    system.membus = SystemXBar()
+    create_caches(system, width,
+                  l1_assoc=args.l1_assoc, l2_assoc=args.l2_assoc,
+                  l1d_mshrs=args.l1d_mshrs, l2_mshrs=args.l2_mshrs)
+    attach_memory(system, args.mem_model)
+
+def connect_ports(system):
+    """Wire CPU, caches, crossbars and the system port in one block.
+
+    system.cpu and the memory system must both exist already; keeping all
+    the port assignments together makes the topology readable at a glance
+    and a miswired port an obvious diff.
+    """
     system.l1i.cpu_side = system.cpu.icache_port
     system.l1d.cpu_side = system.cpu.dcache_port
-    
-    # Connect L1 caches to L2 crossbar
     system.l1i.mem_side = system.tol2bus.cpu_side_ports
     system.l1d.mem_side = system.tol2bus.cpu_side_ports
-    
-    # Connect L2 crossbar to L2 cache
     system.l2.cpu_side = system.tol2bus.mem_side_ports
-    
-    # Connect L2 cache to memory bus
     system.l2.mem_side = system.membus.cpu_side_ports
-    
-    # Create memory controller
-    system.mem_ctrl = MemCtrl()
-    system.mem_ctrl.dram = DDR3_1600_8x8()
-    system.mem_ctrl.dram.range = system.mem_ranges[0]
-    system.mem_ctrl.port = system.membus.mem_side_ports
-    
-    # Connect system port
     system.system_port = system.membus.cpu_side_ports
-    
-    # Create process
+
+# The parser is built once at import so in-process harnesses can call
+# run(argv) repeatedly without rebuilding it
+PARSER = argparse.ArgumentParser(description='Superscalar Pipeline Test')
+PARSER.add_argument('--width', type=str, default='2',
+                    help='Width of the pipeline (instructions per stage); '
+                         'one value per run (sweep widths with '
+                         'run_sweep.py or compare_widths.py)')
+PARSER.add_argument('--bp-type', type=str, default='TournamentBP',
+                    help='Branch predictor type, one of: '
+                         + ', '.join(SUPERSCALAR_BP_FACTORIES))
+PARSER.add_argument('--fast-forward', action='store_true',
+                    help='Run the pre-ROI region on AtomicSimpleCPU and '
+                         'switch to the timing CPU at the workbegin marker')
+PARSER.add_argument('--forward-delay', type=int, default=None,
+                    help='Front-end stage forwarding delay in cycles '
+                         '(default 0 for width 1, 1 for wider pipelines)')
+PARSER.add_argument('--l1-assoc', type=int, default=2,
+                    help='L1 cache associativity (tag lookups cost '
+                         'simulator work linear in assoc)')
+PARSER.add_argument('--l2-assoc', type=int, default=8,
+                    help='L2 cache associativity')
+PARSER.add_argument('--l1d-mshrs', type=int, default=None,
+                    help='L1D MSHR count (default scales with width)')
+PARSER.add_argument('--l2-mshrs', type=int, default=None,
+                    help='L2 MSHR count (default scales with width)')
+PARSER.add_argument('--mem-model', type=str, default='ddr3',
+                    choices=['ddr3', 'simple'],
+                    help='Main memory model (simple trades DRAM '
+                         'fidelity for simulation speed)')
+PARSER.add_argument('--model', type=str, default='auto',
+                    choices=['auto', 'minor', 'o3'],
+                    help='CPU model; auto picks o3 for width > 1 and '
+                         'minor for the scalar baseline')
+PARSER.add_argument('--debug', action='store_true',
+                    help='Print per-parameter pipeline diagnostics')
+
+def run_one(args, width, bp_type):
+    """Build, simulate and report one (width, bp_type) configuration."""
+    # Create the system
+    system = System()
+
+    # Set up clock domain
+    system.clk_domain = SrcClockDomain()
+    system.clk_domain.clock = '2GHz'
+    system.clk_domain.voltage_domain = VoltageDomain()
+
+    # Set up memory mode
+    system.mem_mode = 'timing'
+    system.mem_ranges = [AddrRange('512MB')]
+
+    # Create CPU - out-of-order for superscalar widths, in-order Minor for
+    # the scalar baseline, unless the model is forced on the command line
+    model = args.model
+    if model == 'auto':
+        model = 'o3' if width > 1 else 'minor'
+    if model == 'o3':
+        timing_cpu = create_o3_cpu(width=width, bp_type=bp_type)
+    else:
+        timing_cpu = create_superscalar_cpu(width=width,
+                                            bp_type=bp_type,
+                                            forward_delay=args.forward_delay)
+
+    if args.fast_forward:
+        # Run the pre-ROI region (loader, libc startup) on the atomic CPU
+        # at functional speed; the timing CPU starts switched out and takes
+        # over at the workload's workbegin marker
+        system.cpu = AtomicSimpleCPU(switched_out=False)
+        system.mem_mode = 'atomic'
+        timing_cpu.switched_out = True
+        system.switch_cpu = timing_cpu
+        system.exit_on_work_items = True
+        system.switch_cpu.createInterruptController()
+    else:
+        system.cpu = timing_cpu
+
+    # Create and connect interrupt controller
+    system.cpu.createInterruptController()
+
+    # Build the memory hierarchy, then wire everything up in one pass
+    build_memory_system(system, args, width)
+    connect_ports(system)
+
+    # Create process, rebuilding the benchmark only if its source changed.
+    # A single stat call covers both the existence and execute-permission
+    # checks; fix up the mode rather than failing inside gem5 later.
+    compile_benchmark()
+    try:
+        st = os.stat(BENCHMARK_BIN)
+    except FileNotFoundError:
+        sys.exit(f"Workload binary not found: {BENCHMARK_BIN}")
+    if not st.st_mode & 0o111:
+        os.chmod(BENCHMARK_BIN, st.st_mode | 0o111)
     process = Process()
-    process.cmd = ['tests/branch_test']
+    process.cmd = [BENCHMARK_BIN]
     system.cpu.workload = process
     system.cpu.createThreads()
-    
+    if args.fast_forward:
+        system.switch_cpu.workload = process
+        system.switch_cpu.createThreads()
+
     # Create root
     root = Root(full_system=False, system=system)
     
     # Print configuration details
     print(f"\n===== SUPERSCALAR PIPELINE CONFIGURATION =====")
-    print(f"Pipeline Width: {args.width}")
-    print(f"Branch Predictor: {args.bp_type}")
+    print(f"Pipeline Width: {width}")
+    print(f"Branch Predictor: {bp_type}")
     print("===========================================\n")
     
     # Instantiate simulation
@@ -172,77 +404,136 @@ def main():
     
     # Run simulation
     print("Starting simulation...")
-    start_time = time.time()
-    exit_event = m5.simulate()
-    end_time = time.time()
+    # perf_counter is monotonic and high-resolution; time.time() is subject
+    # to NTP slews, which matters for short before/after comparisons
+    start_time = time.perf_counter()
+    if args.fast_forward:
+        # Fast-forward until the workload signals its region of interest,
+        # then drain, swap in the timing CPU and clear the warm-up stats so
+        # the report covers only the ROI
+        exit_event = m5.simulate()
+        if exit_event.getCause() == 'workbegin':
+            print(f"ROI begins @ tick {m5.curTick()}; "
+                  "switching to the timing CPU")
+            m5.switchCpus(system, [(system.cpu, system.switch_cpu)])
+            m5.stats.reset()
+            exit_event = m5.simulate()
+        else:
+            print("Workload never raised workbegin; "
+                  "fast-forward covered the whole run")
+    else:
+        exit_event = m5.simulate()
+    end_time = time.perf_counter()
     sim_seconds = m5.curTick() / 1e12  # Convert ticks to seconds
     wall_seconds = end_time - start_time
     print(f"Exiting @ tick {m5.curTick()} because {exit_event.getCause()}")
     print(f"Simulation took {wall_seconds:.2f} seconds of wall clock time")
+    # Host simulation rate tracks simulator throughput independently of
+    # guest IPC, so sweep tooling can spot simulator-side regressions
+    if wall_seconds > 0:
+        print(f"Host simulation rate: "
+              f"{m5.curTick() / wall_seconds:.3e} ticks/s")
     
     # Dump statistics
     print("\nDumping statistics...")
     m5.stats.dump()
     
-    # Print performance statistics
-    print("\n===== PERFORMANCE STATISTICS =====")
-    
+    # Read the dumped stats file once; each stat is one dict lookup rather
+    # than a pybind attribute fetch per metric. Bind the stats dict into a
+    # local helper so the lookups below don't repeat it.
+    stats = parse_stats(os.path.join(m5.options.outdir, 'stats.txt'))
+
+    # With fast-forward the CPU of interest is the switched-in one, whose
+    # stats land under its own SimObject path
+    cpu_path = 'system.switch_cpu' if args.fast_forward else 'system.cpu'
+
+    def sv(name, default=0):
+        return stat_value(stats, name, default)
+
+    # Collect the report into a list and emit it with a single write,
+    # instead of ~20 line-buffered print calls
+    lines = []
+
+    # Performance statistics
+    lines.append("\n===== PERFORMANCE STATISTICS =====")
+
     # Get CPU stats
-    try:
-        cycles = system.cpu.numCycles
-        print(f"Cycles: {cycles}")
-    except AttributeError:
-        print("Could not access numCycles")
-        cycles = 0
-        
-    try:
-        instructions = system.cpu.committedInsts
-        print(f"Instructions (committedInsts): {instructions}")
-    except AttributeError:
-        try:
-            instructions = system.cpu.numInsts
-            print(f"Instructions (numInsts): {instructions}")
-        except AttributeError:
-            print("Could not access instruction count")
+    cycles = sv(f'{cpu_path}.numCycles')
+    lines.append(f"Cycles: {cycles}")
+
+    instructions = sv(f'{cpu_path}.committedInsts', None)
+    if instructions is not None:
+        lines.append(f"Instructions (committedInsts): {instructions}")
+    else:
+        instructions = sv('simInsts', None)
+        if instructions is not None:
+            lines.append(f"Instructions (simInsts): {instructions}")
+        else:
+            lines.append("Could not access instruction count")
             instructions = 0
-    
+
     # Calculate IPC and CPI
     if cycles > 0 and instructions > 0:
-        ipc = instructions / cycles
-        cpi = cycles / instructions
-        print(f"IPC (Instructions Per Cycle): {ipc:.4f}")
-        print(f"CPI (Cycles Per Instruction): {cpi:.4f}")
+        ipc, cpi = compute_perf(cycles, instructions)
+        lines.append(f"IPC (Instructions Per Cycle): {ipc:.4f}")
+        lines.append(f"CPI (Cycles Per Instruction): {cpi:.4f}")
     else:
-        print("Cannot calculate IPC/CPI: cycles or instructions is zero")
-    
-    # Branch prediction stats
-    if hasattr(system.cpu, 'branchPred'):
-        try:
-            lookups = system.cpu.branchPred.lookups
-            incorrect = system.cpu.branchPred.incorrect
-            correct = lookups - incorrect
-            accuracy = (correct / lookups) * 100 if lookups > 0 else 0
-            
-            print("\n===== BRANCH PREDICTION STATISTICS =====")
-            print(f"Branch Predictor Type: {args.bp_type}")
-            print(f"Total Branch Predictions: {lookups}")
-            print(f"Correct Predictions: {correct}")
-            print(f"Incorrect Predictions: {incorrect}")
-            print(f"Prediction Accuracy: {accuracy:.2f}%")
-        except AttributeError as e:
-            print(f"Error accessing branch predictor statistics: {e}")
-    
-    # Print pipeline configuration
-    print("\n===== PIPELINE CONFIGURATION =====")
-    print(f"Pipeline Width: {args.width}")
-    for attr in dir(system.cpu):
-        if attr.startswith('execute') or attr.startswith('decode') or attr.startswith('fetch'):
-            try:
-                value = getattr(system.cpu, attr)
-                if isinstance(value, (int, float, bool)):
-                    print(f"{attr}: {value}")
-            except:
-                pass
+        lines.append("Cannot calculate IPC/CPI: cycles or instructions is zero")
+
+    # Branch prediction stats; BPredUnit dumps condPredicted/condIncorrect
+    # (there is no 'incorrect' stat in stats.txt)
+    lookups = sv(f'{cpu_path}.branchPred.condPredicted', None)
+    incorrect = sv(f'{cpu_path}.branchPred.condIncorrect', None)
+    if lookups is None or incorrect is None:
+        lines.append("Branch predictor statistics not present in stats.txt")
+    else:
+        correct = lookups - incorrect
+        accuracy = (correct / lookups) * 100 if lookups > 0 else 0
+
+        lines.append("\n===== BRANCH PREDICTION STATISTICS =====")
+        lines.append(f"Branch Predictor Type: {bp_type}")
+        lines.append(f"Total Branch Predictions: {lookups}")
+        lines.append(f"Correct Predictions: {correct}")
+        lines.append(f"Incorrect Predictions: {incorrect}")
+        lines.append(f"Prediction Accuracy: {accuracy:.2f}%")
+
+    # Pipeline configuration; the per-parameter dump is a diagnostic and
+    # stays off unless explicitly requested
+    lines.append("\n===== PIPELINE CONFIGURATION =====")
+    lines.append(f"Pipeline Width: {width}")
+    if args.debug:
+        names = O3_WIDTH_PARAMS if model == 'o3' else MINOR_WIDTH_PARAMS
+        for name in names:
+            lines.append(f"{name}: {getattr(timing_cpu, name)}")
+
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+def run(argv=None):
+    args = PARSER.parse_args(argv)
+
+    widths = [int(w) for w in args.width.split(',')]
+    bp_types = args.bp_type.split(',')
+    for bp_type in bp_types:
+        if bp_type not in SUPERSCALAR_BP_FACTORIES:
+            PARSER.error(f"unknown --bp-type {bp_type!r} (choose from "
+                         f"{', '.join(SUPERSCALAR_BP_FACTORIES)})")
+
+    # One configuration per gem5 process: the config layer enforces Root
+    # as a singleton (a second Root() fatals) and m5.instantiate() can
+    # only run once, so an in-process sweep cannot work. Comma-separated
+    # lists are still parsed so the mistake gets a clear error instead of
+    # an argparse int() traceback; real sweeps run one process per
+    # configuration via run_sweep.py or compare_widths.py.
+    if len(widths) > 1 or len(bp_types) > 1:
+        PARSER.error('gem5 simulates one configuration per process; '
+                     'sweep multiple widths/predictors with run_sweep.py '
+                     'or compare_widths.py')
+
+    run_one(args, widths[0], bp_types[0])
+
+def main():
+    run()
 
 if __name__ == "__main__":
     main()